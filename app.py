@@ -1,17 +1,16 @@
 import streamlit as st
-import pandas as pd
 import os
-import json
-import base64
 from datetime import datetime, timedelta
-import pytz
-from model import generate_trade_signal, load_model
-from data import get_macro_data, get_price_data
-from utils import load_secrets
-from train_pipeline import run_training_pipeline
+from model import generate_trade_signal, load_model, build_features
+from monitoring import update_monitor, load_feature_stats, load_monitor_state, monitoring_report, models_needing_retrain
+from data import get_macro_data, get_price_data, INTRADAY_INTERVALS, INTRADAY_RETENTION_DAYS
+from utils import load_secrets, is_market_open
+from signal_store import load_signal_frame
+from cache import shared_cache, market_aware_ttl, MACRO_TTL, MODEL_TTL
+from train_pipeline import run_training_pipeline, get_drive_service
+from manifest import fetch_manifest, read_local_manifest, latest_version, file_md5
+from manifest import available_tickers as list_model_tickers
 from report_generator import generate_pdf_report, streamlit_download_button
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseDownload
 from components.dashboard_insights import (
     log_signal_to_jsonl,
@@ -26,39 +25,52 @@ secrets = load_secrets()
 fred_key = secrets.get("FRED_API_KEY")
 drive_id = secrets.get("GDRIVE_FOLDER_ID")
 
-def is_market_open():
-    now_utc = datetime.utcnow()
-    est = pytz.utc.localize(now_utc).astimezone(pytz.timezone("US/Eastern"))
-    open_time = est.replace(hour=9, minute=30, second=0, microsecond=0)
-    close_time = est.replace(hour=16, minute=0, microsecond=0)
-    return est.weekday() < 5 and open_time <= est <= close_time
-
-def download_latest_model_for_ticker(ticker, folder_id):
-    encoded = os.getenv("GDRIVE_CREDENTIALS_JSON")
-    creds = json.loads(base64.b64decode(encoded).decode())
-    credentials = service_account.Credentials.from_service_account_info(creds)
-    service = build("drive", "v3", credentials=credentials)
-    prefix = f"model_{ticker.upper()}_"
-    query = f"'{folder_id}' in parents and trashed = false and name contains '{prefix}'"
-    files = service.files().list(q=query, fields="files(id, name, createdTime)").execute().get("files", [])
-    if not files:
-        raise FileNotFoundError(f"No model found for {ticker.upper()} in Drive")
-    latest = max(files, key=lambda f: f["createdTime"])
-    request = service.files().get_media(fileId=latest["id"])
-    with open("model.json", "wb") as f:
+def get_model_manifest(folder_id):
+    def fetch():
+        try:
+            return fetch_manifest(get_drive_service(), folder_id)
+        except Exception as e:
+            cached = read_local_manifest()
+            if cached is None:
+                raise
+            print(f"⚠️ Using cached model manifest: {e}")
+            return cached
+    return shared_cache.get_or_fetch(("manifest", folder_id), fetch, ttl=MODEL_TTL, persist=False)
+
+def download_latest_model_for_ticker(ticker, folder_id, interval="1d", download_dir=None):
+    latest = latest_version(get_model_manifest(folder_id), ticker, interval)
+    if latest is None:
+        raise FileNotFoundError(f"No {interval} model found for {ticker.upper()} in Drive")
+    # Shared callers download to a per-version file so sessions never
+    # overwrite each other's model.json mid-read.
+    dest = os.path.join(download_dir, latest["name"]) if download_dir else "model.json"
+    if os.path.exists(dest) and latest.get("md5") and file_md5(dest) == latest["md5"]:
+        return latest["name"]
+    request = get_drive_service().files().get_media(fileId=latest["file_id"])
+    with open(dest, "wb") as f:
         downloader = MediaIoBaseDownload(f, request)
         done = False
         while not done:
             status, done = downloader.next_chunk()
+    if latest.get("md5") and file_md5(dest) != latest["md5"]:
+        os.remove(dest)
+        raise IOError(f"Checksum mismatch for {latest['name']}")
     return latest["name"]
 
+def load_latest_model(ticker, folder_id, interval="1d"):
+    model_file = download_latest_model_for_ticker(ticker, folder_id, interval, download_dir="models")
+    return model_file, load_model(os.path.join("models", model_file))
+
 # --- Sidebar UI ---
 with st.sidebar:
     st.header("⚙️ Symbol & Model Controls")
 
     os.makedirs("models", exist_ok=True)
-    model_files = [f for f in os.listdir("models") if f.startswith("model_") and f.endswith(".json")]
-    available_tickers = sorted(list({f.split("_")[1] for f in model_files}))
+    try:
+        available_tickers = list_model_tickers(get_model_manifest(drive_id))
+    except Exception as e:
+        st.caption(f"⚠️ Model manifest unavailable: {e}")
+        available_tickers = []
     default_symbol = available_tickers[0] if available_tickers else "SPY"
 
     selected_ticker = st.selectbox("📂 Load Existing Model", available_tickers, index=0) if available_tickers else default_symbol
@@ -72,7 +84,11 @@ with st.sidebar:
             retrain_requested = True
 
     ticker = new_ticker if new_ticker else selected_ticker
-    lookback = st.slider("📅 Lookback Window", 30, 180, 90)
+    timeframe = st.selectbox("🕒 Timeframe", ["1d"] + list(INTRADAY_INTERVALS), index=0)
+    if timeframe == "1d":
+        lookback = st.slider("📅 Lookback Window", 30, 180, 90)
+    else:
+        lookback = st.slider("📅 Lookback Window (days)", 1, INTRADAY_RETENTION_DAYS, 5)
 
     st.markdown("---")
     market_open = is_market_open()
@@ -83,11 +99,15 @@ with st.sidebar:
         st.session_state.last_fetch = None
     if "cached_price_df" not in st.session_state:
         st.session_state.cached_price_df = None
+    if "cached_price_key" not in st.session_state:
+        st.session_state.cached_price_key = None
 
     refresh_requested = st.button("🔄 Refresh Now")
     time_since = (now - st.session_state.last_fetch) if st.session_state.last_fetch else timedelta(minutes=999)
     data_stale = time_since > timedelta(minutes=5)
-    needs_refresh = refresh_requested or (market_open and data_stale) or (st.session_state.cached_price_df is None)
+    price_key = (ticker, timeframe, lookback)
+    needs_refresh = (refresh_requested or (market_open and data_stale) or (st.session_state.cached_price_df is None)
+                     or st.session_state.cached_price_key != price_key)
 
     if not market_open:
         st.caption("🔒 Market is closed. Live data paused.")
@@ -99,23 +119,31 @@ with st.sidebar:
 # --- Handle retrain (if requested) ---
 if retrain_requested:
     with st.spinner("Training and uploading model..."):
-        result = run_training_pipeline(ticker=ticker)
+        result = run_training_pipeline(ticker=ticker, interval=timeframe)
     st.success(result)
+    shared_cache.invalidate(("model", ticker.upper(), timeframe))
+    shared_cache.invalidate(("manifest", drive_id))
     st.experimental_rerun()
 
 # --- Load model ---
 try:
-    model_file = download_latest_model_for_ticker(ticker, folder_id=drive_id)
+    model_file, model = shared_cache.get_or_fetch(
+        ("model", ticker.upper(), timeframe),
+        lambda: load_latest_model(ticker, drive_id, timeframe),
+        ttl=MODEL_TTL, persist=False)
     st.success(f"📥 Model loaded: {model_file}")
-    model = load_model("model.json")
 except Exception as e:
     st.error(f"❌ Could not load model: {e}")
     st.stop()
 
 # --- Fetch data ---
-macro_df = get_macro_data(fred_key)
+macro_df = shared_cache.get_or_fetch(("macro",), lambda: get_macro_data(fred_key), ttl=MACRO_TTL)
 if needs_refresh:
-    st.session_state.cached_price_df = get_price_data(ticker, lookback)
+    st.session_state.cached_price_df = shared_cache.get_or_fetch(
+        ("price", ticker.upper(), timeframe, lookback),
+        lambda: get_price_data(ticker, lookback, interval=timeframe),
+        ttl=market_aware_ttl(), refresh=refresh_requested)
+    st.session_state.cached_price_key = price_key
     st.session_state.last_fetch = now
 
 price_df = st.session_state.cached_price_df
@@ -125,7 +153,7 @@ if price_df is None or price_df.empty or macro_df.empty:
 
 # --- Show latest price ---
 try:
-    latest_close_date = price_df.index[-1].strftime("%Y-%m-%d")
+    latest_close_date = price_df.index[-1].strftime("%Y-%m-%d" if timeframe == "1d" else "%Y-%m-%d %H:%M")
     latest_close_price = float(price_df["Close"].iloc[-1])
     st.info(f"📌 Latest close price for **{ticker.upper()}** as of **{latest_close_date}**: **${latest_close_price:.2f}**")
 except Exception:
@@ -133,14 +161,18 @@ except Exception:
 	
 # --- Generate signal and display context ---
 try:
-    regime, signal, confidence = generate_trade_signal(price_df, macro_df)
+    regime, signal, confidence = shared_cache.get_or_fetch(
+        ("signal", ticker.upper(), timeframe, lookback, model_file, price_df.index[-1]),
+        lambda: generate_trade_signal(price_df, macro_df, model=model),
+        ttl=market_aware_ttl(), refresh=refresh_requested)
     new_signal = {
-        "timestamp": datetime.now().isoformat(),
+        "timestamp": datetime.utcnow().isoformat(),
         "ticker": ticker.upper(),
         "regime": regime,
         "signal": signal,
         "confidence": float(confidence),
-        "price": latest_close_price
+        "price": latest_close_price,
+        "model": model_file
     }
     signal_entry = log_signal_to_jsonl(new_signal)
     display_signal_context(signal_entry, model_file)
@@ -148,6 +180,16 @@ except Exception as e:
     st.error(f"Prediction error: {e}")
     st.stop()
 
+# --- Score past signals and track feature drift ---
+if needs_refresh:
+    try:
+        update_monitor(ticker, price_df, model_file,
+                       features=build_features(price_df, macro_df),
+                       feature_stats=load_feature_stats(model),
+                       interval=timeframe)
+    except Exception as e:
+        st.warning(f"⚠️ Model monitoring update failed: {e}")
+
 # --- Dashboard Tabs ---
 tab1, tab2 = st.tabs(["📊 Dashboard", "📜 Signal History"])
 
@@ -169,19 +211,16 @@ with tab1:
 
 This chart simulates two paths your capital could take:
 
-- **📈 Strategy Line**: Invest only when the model says **Buy**
-- **📊 Buy & Hold Line**: Always stay in the market
+- **📈 Strategy Line**: Hold every logged ticker whose latest signal is **Buy**, weighted equally, by confidence, or by volatility target
+- **📊 Buy & Hold Line**: Split capital equally across every logged ticker once and never rebalance
 
-📌 No trading fees or slippage are applied — just pure signal-based simulation.
+📌 Set the rebalance frequency and per-trade cost (in basis points) above the chart. Between rebalances positions drift with prices; with zero cost no fees or slippage are applied.
 """)
 
 with tab2:
     st.subheader("📜 Signal Log")
     try:
-        with open("logs/signal_log.jsonl") as f:
-            rows = [json.loads(line) for line in f]
-        df = pd.DataFrame(rows)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        df = load_signal_frame()
         df = df[df["ticker"].str.upper() == ticker.upper()]
 
         df["returns"] = 0.0
@@ -217,6 +256,18 @@ with tab2:
             pdf_path = generate_pdf_report(metrics, df.iloc[-1], recent, df)
             st.markdown(streamlit_download_button(pdf_path), unsafe_allow_html=True)
 
+        st.markdown("#### 🩺 Model Health")
+        monitor_state = load_monitor_state()
+        health = monitoring_report(monitor_state)
+        if health.empty:
+            st.caption("No signals have been scored against realized prices yet.")
+        else:
+            st.dataframe(health, use_container_width=True)
+            flagged = models_needing_retrain(monitor_state)
+            if flagged:
+                names = ", ".join(f"{t} ({i})" for t, i in flagged)
+                st.warning(f"⚠️ Degraded or drifting models: {names} — consider retraining.")
+
         st.markdown("#### 🧾 Full Signal Log")
         st.dataframe(df.sort_values("timestamp", ascending=False), use_container_width=True)
 
@@ -0,0 +1,136 @@
+import os
+import time
+import pickle
+import sqlite3
+import threading
+from utils import is_market_open, seconds_until_market_open
+
+MARKET_OPEN_TTL = 300      # matches the dashboard's 5-minute auto-refresh
+MARKET_CLOSED_TTL = 3600
+MACRO_TTL = 6 * 3600       # FRED series update monthly at most
+MODEL_TTL = 3600
+PURGE_INTERVAL = 60        # seconds between sweeps of expired entries
+
+
+def market_aware_ttl(open_ttl=MARKET_OPEN_TTL, closed_ttl=MARKET_CLOSED_TTL):
+    if is_market_open():
+        return open_ttl
+    # Entries cached before the bell must not outlive the open.
+    return max(min(closed_ttl, seconds_until_market_open()), 1)
+
+
+class _Call:
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SharedCache:
+    """Process-wide TTL cache with single-flight fetches.
+
+    Concurrent misses for the same key wait on the first caller's fetch
+    instead of issuing their own. With ``db_path`` set, picklable values are
+    also written to a SQLite file so other worker processes on the host can
+    reuse them. Keys such as per-bar signals keep changing, so expired
+    entries are swept on insert, at most every ``purge_interval`` seconds.
+    """
+
+    def __init__(self, db_path=None, purge_interval=PURGE_INTERVAL):
+        self._entries = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+        self._purge_interval = purge_interval
+        self._last_purge = time.time()
+        self._db_path = db_path
+        if db_path:
+            os.makedirs(os.path.dirname(db_path) or ".", exist_ok=True)
+            with self._connect() as conn:
+                conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL, value BLOB)")
+
+    def _connect(self):
+        return sqlite3.connect(self._db_path, timeout=10)
+
+    def _disk_get(self, key, now):
+        with self._connect() as conn:
+            row = conn.execute("SELECT expires, value FROM cache WHERE key = ?", (repr(key),)).fetchone()
+        if row and row[0] > now:
+            return row[0], pickle.loads(row[1])
+        return None
+
+    def _disk_put(self, key, expires, value):
+        with self._connect() as conn:
+            conn.execute("INSERT OR REPLACE INTO cache (key, expires, value) VALUES (?, ?, ?)",
+                         (repr(key), expires, pickle.dumps(value)))
+
+    def get_or_fetch(self, key, fetch, ttl, persist=True, refresh=False):
+        """Return the cached value for ``key`` or call ``fetch()`` once to fill it.
+
+        Empty results (e.g. the empty DataFrame the data loaders return on
+        failure) are handed back but not cached, so the next caller retries.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now and not refresh:
+                return entry[1]
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _Call()
+
+        if not leader:
+            call.event.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            hit = None
+            if self._db_path and persist and not refresh:
+                hit = self._disk_get(key, now)
+            if hit:
+                expires, value = hit
+            else:
+                value = fetch()
+                expires = time.time() + ttl
+                if getattr(value, "empty", False):
+                    expires = 0
+                elif self._db_path and persist:
+                    self._disk_put(key, expires, value)
+            with self._lock:
+                if expires:
+                    self._entries[key] = (expires, value)
+                purge = time.time() - self._last_purge >= self._purge_interval
+            if purge:
+                self.purge_expired()
+            call.value = value
+            return value
+        except Exception as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+            call.event.set()
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+        if self._db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM cache WHERE key = ?", (repr(key),))
+
+    def purge_expired(self):
+        now = time.time()
+        with self._lock:
+            self._last_purge = now
+            for key in [k for k, (expires, _) in self._entries.items() if expires <= now]:
+                del self._entries[key]
+        if self._db_path:
+            with self._connect() as conn:
+                conn.execute("DELETE FROM cache WHERE expires <= ?", (now,))
+
+
+# Set SHARED_CACHE_DB (e.g. "cache/shared.sqlite") to share across worker processes.
+shared_cache = SharedCache(os.getenv("SHARED_CACHE_DB"))
@@ -2,10 +2,12 @@ import os
 import json
 import streamlit as st
 import pandas as pd
-import numpy as np
 import plotly.graph_objs as go
 from datetime import datetime
 import yfinance as yf
+from signal_store import load_signal_frame
+from cache import shared_cache, market_aware_ttl
+from portfolio import WEIGHTING_SCHEMES, simulate_portfolio, rolling_metrics
 
 
 def log_signal_to_jsonl(new_entry, log_path="logs/signal_log.jsonl"):
@@ -16,7 +18,7 @@ def log_signal_to_jsonl(new_entry, log_path="logs/signal_log.jsonl"):
             lines = f.readlines()
             if lines:
                 last_entry = json.loads(lines[-1])
-                keys = ["ticker", "regime", "signal"]
+                keys = ["ticker", "model", "regime", "signal"]
                 if all(new_entry.get(k) == last_entry.get(k) for k in keys):
                     return last_entry
     with open(log_path, "a") as f:
@@ -41,7 +43,8 @@ def display_signal_context(signal_entry, model_name):
         st.success("✅ New signal recorded.")
     else:
         st.info("📌 Market unchanged — showing latest known signal.")
-    elapsed = (datetime.now() - datetime.fromisoformat(signal_entry['timestamp'])).total_seconds() / 60
+    # Signal timestamps are logged in naive UTC.
+    elapsed = (datetime.utcnow() - datetime.fromisoformat(signal_entry['timestamp'])).total_seconds() / 60
     st.caption(f"⏱️ Last update: **{elapsed:.1f} minutes ago**")
 
 
@@ -82,15 +85,14 @@ def _prep_price_df(price_df):
 
 def plot_price_with_regime(log_path="logs/signal_log.jsonl"):
     try:
-        with open(log_path) as f:
-            entries = [json.loads(line) for line in f if line.strip()]
-        df = pd.DataFrame(entries)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        df = load_signal_frame(log_path)
         df = df.sort_values("timestamp")
         ticker = df["ticker"].iloc[-1]
         start = df["timestamp"].min().strftime("%Y-%m-%d")
 
-        price_df = yf.download(ticker, start=start, auto_adjust=True)
+        price_df = shared_cache.get_or_fetch(("price_history", ticker, start),
+                                             lambda: yf.download(ticker, start=start, auto_adjust=True),
+                                             ttl=market_aware_ttl())
         price_df = _prep_price_df(price_df)
 
         if price_df.empty:
@@ -160,39 +162,69 @@ def plot_price_with_regime(log_path="logs/signal_log.jsonl"):
         st.warning(f"Could not render chart: {e}")
 
 
+def _signal_matrices(df, index):
+    # One column per ticker, last logged signal carried forward onto price bars.
+    df = df.assign(ticker=df["ticker"].str.upper(),
+                   long=(df["signal"] == "Buy").astype(float),
+                   confidence=df["confidence"].astype(float))
+    signals = df.pivot_table(index="timestamp", columns="ticker", values="long", aggfunc="last")
+    confidence = df.pivot_table(index="timestamp", columns="ticker", values="confidence", aggfunc="last")
+    signals = signals.reindex(signals.index.union(index)).ffill().reindex(index)
+    confidence = confidence.reindex(confidence.index.union(index)).ffill().reindex(index)
+    return signals, confidence
+
+
+def _download_close_matrix(tickers, start):
+    raw = yf.download(tickers, start=start, auto_adjust=True, progress=False)
+    if raw.empty:
+        return pd.DataFrame()
+    close = raw["Close"]
+    if isinstance(close, pd.Series):
+        close = close.to_frame(tickers[0])
+    close.index = pd.to_datetime(close.index)
+    return close.dropna(how="all")
+
+
 def simulate_strategy_vs_hold(log_path="logs/signal_log.jsonl"):
     try:
-        with open(log_path) as f:
-            logs = [json.loads(line) for line in f if line.strip()]
-        df = pd.DataFrame(logs)
-        df["timestamp"] = pd.to_datetime(df["timestamp"])
+        df = load_signal_frame(log_path)
         df = df.sort_values("timestamp")
-        ticker = df["ticker"].iloc[-1]
+        tickers = sorted(df["ticker"].str.upper().unique())
         start = df["timestamp"].min().strftime("%Y-%m-%d")
 
-        price_df = yf.download(ticker, start=start, auto_adjust=True)
-        price_df = _prep_price_df(price_df)
-        if price_df.empty:
+        # Widget changes rerun the script; reuse the batch download across
+        # reruns and sessions until the market-aware TTL expires.
+        prices = shared_cache.get_or_fetch(("close_matrix", tuple(tickers), start),
+                                           lambda: _download_close_matrix(tickers, start),
+                                           ttl=market_aware_ttl())
+        if prices.empty:
             st.info("📭 No price data available to simulate performance.")
             return
 
-        price_df = price_df.reset_index()
-        merged = pd.merge_asof(price_df, df[["timestamp", "signal"]],
-                               on="timestamp", direction="backward")
-        merged["signal"] = merged["signal"].ffill()
-        merged["daily_return"] = merged["Close"].pct_change()
-        merged["strategy_return"] = np.where(merged["signal"] == "Buy", merged["daily_return"], 0)
-        merged["equity_curve"] = (1 + merged["strategy_return"]).cumprod()
-        merged["buy_hold_curve"] = (1 + merged["daily_return"]).cumprod()
+        c1, c2, c3 = st.columns(3)
+        weighting = c1.selectbox("⚖️ Weighting", list(WEIGHTING_SCHEMES), index=0)
+        rebalance_every = c2.number_input("🔁 Rebalance every N bars", 1, 60, 1)
+        cost_bps = c3.number_input("💸 Cost per trade (bps)", 0.0, 100.0, 0.0, step=0.5)
+
+        signals, confidence = _signal_matrices(df, prices.index)
+        curve, weights = simulate_portfolio(prices, signals, confidence, weighting=weighting,
+                                            rebalance_every=rebalance_every, cost_bps=cost_bps)
+        curve = curve.reset_index(names="timestamp")
 
         fig = go.Figure()
-        fig.add_trace(go.Scatter(x=merged["timestamp"], y=merged["equity_curve"],
+        fig.add_trace(go.Scatter(x=curve["timestamp"], y=curve["equity_curve"],
                                  mode="lines", name="📈 Strategy"))
-        fig.add_trace(go.Scatter(x=merged["timestamp"], y=merged["buy_hold_curve"],
+        fig.add_trace(go.Scatter(x=curve["timestamp"], y=curve["buy_hold_curve"],
                                  mode="lines", name="📊 Buy & Hold", line=dict(dash="dot")))
-        fig.update_layout(title="📈 Strategy vs Buy & Hold Performance",
+        fig.update_layout(title=f"📈 Portfolio Strategy vs Buy & Hold ({len(tickers)} tickers)",
                           xaxis_title="Date", yaxis_title="Cumulative Return", height=400)
         st.plotly_chart(fig, use_container_width=True)
 
+        metrics = rolling_metrics(curve.set_index("timestamp")["strategy_return"])
+        with st.expander("📉 Rolling metrics & weights"):
+            st.line_chart(metrics[["rolling_sharpe"]])
+            st.area_chart(metrics[["drawdown"]])
+            st.dataframe(weights.tail(10), use_container_width=True)
+
     except Exception as e:
-        st.warning(f"Could not simulate performance: {e}")
\ No newline at end of file
+        st.warning(f"Could not simulate performance: {e}")
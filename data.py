@@ -1,17 +1,141 @@
+import threading
+import numpy as np
 import pandas as pd
 import yfinance as yf
 from fredapi import Fred
 
-def get_price_data(ticker="SPY", lookback=90):
+# Intraday bars are built from a single 1-minute base series per ticker;
+# coarser timeframes are resampled from it instead of downloaded separately.
+BASE_INTERVAL = "1m"
+INTRADAY_INTERVALS = {"1m": 1, "5m": 5, "15m": 15, "30m": 30, "60m": 60}
+INTRADAY_RETENTION_DAYS = 7  # yfinance serves at most 7 days of 1m bars
+
+# ticker -> {"base": DataFrame, "resampled": {interval: DataFrame}}
+_intraday_cache = {}
+_intraday_locks = {}
+_intraday_locks_guard = threading.Lock()
+
+
+def _ticker_lock(key):
+    # One lock per ticker so a slow download only blocks its own ticker.
+    with _intraday_locks_guard:
+        return _intraday_locks.setdefault(key, threading.Lock())
+
+
+def _close_frame(df):
+    if df.empty:
+        return pd.DataFrame(columns=["Close"], dtype=np.float32)
+    if isinstance(df.columns, pd.MultiIndex):
+        df = df.copy()
+        df.columns = df.columns.get_level_values(0)
+    return df[["Close"]].dropna().astype(np.float32)
+
+
+def get_price_data(ticker="SPY", lookback=90, interval="1d"):
+    if interval in INTRADAY_INTERVALS:
+        return get_intraday_price_data(ticker, interval, lookback_days=lookback)
     try:
         print(f"🧪 Fetching price data for: {ticker}")
         df = yf.download(ticker, period=f"{lookback}d", progress=False, auto_adjust=True)
-        df = df[["Close"]]
-        return df.dropna()
+        return _close_frame(df)
     except Exception as e:
         print(f"Failed to load price data: {e}")
         return pd.DataFrame()
 
+
+def _trim_to_retention(df, retention_days=INTRADAY_RETENTION_DAYS):
+    if df.empty:
+        return df
+    cutoff = df.index[-1] - pd.Timedelta(days=retention_days)
+    return df[df.index > cutoff]
+
+
+def merge_base_bars(base_df, new_df, retention_days=INTRADAY_RETENTION_DAYS):
+    """Append freshly downloaded bars to the cached base series.
+
+    Overlapping timestamps take the newer value (the last bar of the previous
+    download is usually still forming). The result is float32 and trimmed to
+    the rolling retention window.
+    """
+    new_df = _close_frame(new_df)
+    if base_df is None or base_df.empty:
+        merged = new_df
+    elif new_df.empty:
+        merged = base_df
+    else:
+        merged = pd.concat([base_df[base_df.index < new_df.index[0]], new_df])
+    return _trim_to_retention(merged.sort_index(), retention_days)
+
+
+def resample_bars(base_df, interval, existing=None):
+    """Resample base bars to ``interval``, reusing already-built buckets.
+
+    Only the last (possibly partial) bucket of ``existing`` and anything after
+    it are recomputed, so each refresh costs O(new bars) rather than a full
+    pass over the retained history.
+    """
+    minutes = INTRADAY_INTERVALS[interval]
+    rule = f"{minutes}min"
+    # Buckets are anchored at midnight; shift them so the first one starts at
+    # the 09:30 open, matching yfinance's own bars (only matters for 60m).
+    offset = pd.Timedelta(minutes=30 % minutes)
+    if base_df.empty:
+        return base_df
+    if existing is not None and not existing.empty:
+        tail = base_df[base_df.index >= existing.index[-1]]
+        head = existing.iloc[:-1]
+        head = head[head.index >= (base_df.index[0] - offset).floor(rule) + offset]
+    else:
+        tail, head = base_df, None
+
+    fresh = tail["Close"].resample(rule, label="left", closed="left", offset=offset).last().dropna()
+    fresh = fresh.to_frame("Close").astype(np.float32)
+    return fresh if head is None else pd.concat([head, fresh])
+
+
+def base_fetch_window(base_df, now=None):
+    """yf.download kwargs that fill the gap since the last cached base bar.
+
+    The window starts at the last cached bar (re-fetching it, since it may
+    still have been forming) and is capped at the retention window, so an
+    idle process catches up on every missed session it still retains.
+    """
+    if base_df is None or base_df.empty:
+        return {"period": f"{INTRADAY_RETENTION_DAYS}d"}
+    last = base_df.index[-1]
+    now = now if now is not None else pd.Timestamp.now(tz=last.tz)
+    return {"start": max(last, now - pd.Timedelta(days=INTRADAY_RETENTION_DAYS))}
+
+
+def get_intraday_price_data(ticker="SPY", interval="5m", lookback_days=5):
+    if interval not in INTRADAY_INTERVALS:
+        raise ValueError(f"Unsupported intraday interval: {interval}")
+    try:
+        key = ticker.upper()
+        # Serialize updates so concurrent sessions don't interleave merges.
+        with _ticker_lock(key):
+            entry = _intraday_cache.setdefault(key, {"base": None, "resampled": {}})
+            window = base_fetch_window(entry["base"])
+            print(f"🧪 Fetching {BASE_INTERVAL} bars for: {ticker} ({window})")
+            new_df = yf.download(ticker, interval=BASE_INTERVAL, progress=False,
+                                 auto_adjust=True, **window)
+            entry["base"] = merge_base_bars(entry["base"], new_df)
+
+            if interval == BASE_INTERVAL:
+                bars = entry["base"]
+            else:
+                bars = resample_bars(entry["base"], interval, entry["resampled"].get(interval))
+                entry["resampled"][interval] = bars
+
+        if bars.empty:
+            return pd.DataFrame()
+        cutoff = bars.index[-1] - pd.Timedelta(days=lookback_days)
+        return bars[bars.index > cutoff]
+    except Exception as e:
+        print(f"Failed to load intraday price data: {e}")
+        return pd.DataFrame()
+
+
 def get_macro_data(fred_key):
     try:
         print(f"🔑 FRED key present: {bool(fred_key)}")
@@ -32,4 +156,4 @@ def get_macro_data(fred_key):
         return df.tail(100).reset_index(drop=True)
     except Exception as e:
         print(f"Failed to load macro data: {e}")
-        return pd.DataFrame()
\ No newline at end of file
+        return pd.DataFrame()
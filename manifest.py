@@ -0,0 +1,185 @@
+import os
+import io
+import re
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from googleapiclient.http import MediaIoBaseUpload, MediaIoBaseDownload
+from model import model_key
+
+MANIFEST_NAME = "model_manifest.json"
+LOCAL_MANIFEST_PATH = os.path.join("models", MANIFEST_NAME)
+MODEL_NAME_RE = re.compile(r"^model_(?P<ticker>[A-Z0-9.^=-]+?)(?:-(?P<interval>\d+m))?_\d{8}_\d{6}\.json$")
+
+_manifest_lock = threading.Lock()
+
+
+def empty_manifest():
+    return {"updated": None, "models": {}}
+
+
+def file_md5(path):
+    # Drive reports md5Checksum for uploaded files, so the same digest is
+    # used to verify downloads.
+    digest = hashlib.md5()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parse_model_name(name):
+    """Split ``model_<TICKER[-interval]>_<YYYYmmdd>_<HHMMSS>.json`` into (ticker, interval).
+
+    Returns None for anything else, including legacy ``model_<date>_<time>.json``
+    files that carry no ticker.
+    """
+    match = MODEL_NAME_RE.match(name)
+    if not match:
+        return None
+    return match["ticker"], match["interval"] or "1d"
+
+
+def add_version(manifest, ticker, interval, version):
+    versions = manifest["models"].setdefault(model_key(ticker, interval), [])
+    # A manifest seeded from a listing may already hold the file just uploaded.
+    versions[:] = [v for v in versions if v["name"] != version["name"]]
+    versions.append({"ticker": ticker.upper(), "interval": interval, **version})
+    versions.sort(key=lambda v: v["created"])
+    manifest["updated"] = datetime.utcnow().isoformat()
+    return manifest
+
+
+def prune_versions(manifest, ticker, interval, max_versions=5):
+    """Drop all but the newest ``max_versions`` entries; returns the dropped ones."""
+    versions = manifest["models"].get(model_key(ticker, interval), [])
+    if len(versions) <= max_versions:
+        return []
+    removed, versions[:] = versions[:-max_versions], versions[-max_versions:]
+    return removed
+
+
+def latest_version(manifest, ticker, interval="1d"):
+    versions = manifest["models"].get(model_key(ticker, interval))
+    return versions[-1] if versions else None
+
+
+def available_tickers(manifest):
+    return sorted({v["ticker"] for versions in manifest["models"].values() for v in versions})
+
+
+def build_manifest_from_files(files):
+    """Seed a manifest from a Drive listing of pre-manifest model files."""
+    manifest = empty_manifest()
+    for f in files:
+        parsed = parse_model_name(f["name"])
+        if parsed is None:
+            continue
+        ticker, interval = parsed
+        add_version(manifest, ticker, interval, {
+            "name": f["name"],
+            "file_id": f["id"],
+            "created": f["createdTime"],
+            "md5": f.get("md5Checksum"),
+        })
+    return manifest
+
+
+# --- Local cache ---
+
+def write_local_manifest(manifest, path=LOCAL_MANIFEST_PATH):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def read_local_manifest(path=LOCAL_MANIFEST_PATH):
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+# --- Drive ---
+
+def _find_manifest_file(service, folder_id):
+    """(file_id, version) of the manifest, or (None, None) if there is none yet."""
+    query = f"'{folder_id}' in parents and trashed = false and name = '{MANIFEST_NAME}'"
+    files = service.files().list(q=query, fields="files(id, version)",
+                                 orderBy="createdTime").execute().get("files", [])
+    return (files[0]["id"], files[0]["version"]) if files else (None, None)
+
+
+def _list_model_files(service, folder_id):
+    query = f"'{folder_id}' in parents and trashed = false and name contains 'model_'"
+    files, page_token = [], None
+    while True:
+        response = service.files().list(q=query, pageSize=1000, pageToken=page_token,
+                                        fields="nextPageToken, files(id, name, createdTime, md5Checksum)").execute()
+        files.extend(response.get("files", []))
+        page_token = response.get("nextPageToken")
+        if not page_token:
+            return files
+
+
+def _download_manifest(service, folder_id):
+    file_id, version = _find_manifest_file(service, folder_id)
+    if not file_id:
+        return build_manifest_from_files(_list_model_files(service, folder_id)), None, None
+    buffer = io.BytesIO()
+    downloader = MediaIoBaseDownload(buffer, service.files().get_media(fileId=file_id))
+    done = False
+    while not done:
+        status, done = downloader.next_chunk()
+    return json.loads(buffer.getvalue().decode()), file_id, version
+
+
+def fetch_manifest(service, folder_id, path=LOCAL_MANIFEST_PATH):
+    """Download the Drive manifest and refresh the local copy.
+
+    Folders trained before the manifest existed get one seeded from a single
+    (paginated) listing of every model file.
+    """
+    manifest, _, _ = _download_manifest(service, folder_id)
+    write_local_manifest(manifest, path)
+    return manifest
+
+
+def update_manifest(service, folder_id, mutate, retries=5, path=LOCAL_MANIFEST_PATH):
+    """Apply ``mutate(manifest)`` and upload it, retrying on detected conflicts.
+
+    Drive v3 has no conditional update, so this is best-effort: the write is
+    skipped and retried if the manifest's version moved since it was read,
+    and after writing the manifest is read back to confirm our copy landed.
+    A trainer that passes its version check inside another's write window
+    can still overwrite that write after it was confirmed, so run one
+    trainer per folder at a time. ``mutate`` must be idempotent
+    (``add_version`` and ``prune_versions`` are) and its return value is
+    passed through once the write is confirmed.
+    """
+    with _manifest_lock:
+        for attempt in range(retries):
+            manifest, file_id, version = _download_manifest(service, folder_id)
+            result = mutate(manifest)
+            current_id, current_version = _find_manifest_file(service, folder_id)
+            if (current_id, current_version) != (file_id, version):
+                print(f"⚠️ Manifest changed during update, retrying ({attempt + 1}/{retries})")
+                time.sleep(attempt + 1)
+                continue
+            media = MediaIoBaseUpload(io.BytesIO(json.dumps(manifest, indent=2).encode()),
+                                      mimetype="application/json")
+            if file_id:
+                service.files().update(fileId=file_id, media_body=media).execute()
+            else:
+                service.files().create(body={"name": MANIFEST_NAME, "parents": [folder_id]},
+                                       media_body=media, fields="id").execute()
+            if _download_manifest(service, folder_id)[0] == manifest:
+                write_local_manifest(manifest, path)
+                return result
+            print(f"⚠️ Manifest write was overtaken, retrying ({attempt + 1}/{retries})")
+            time.sleep(attempt + 1)
+    raise RuntimeError("Could not update the model manifest after multiple attempts")
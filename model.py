@@ -8,6 +8,14 @@ def load_model(model_path="model.json"):
     model.load_model(model_path)
     return model
 
+def model_key(ticker, interval="1d"):
+    # Daily models keep the original naming; intraday models get their own
+    # key so "model_SPY_" lookups never pick up a 5m model.
+    return ticker.upper() if interval == "1d" else f"{ticker.upper()}-{interval}"
+
+def model_prefix(ticker, interval="1d"):
+    return f"model_{model_key(ticker, interval)}_"
+
 def build_features(price_df, macro_df):
     df = price_df.copy()
     df["return"] = df["Close"].pct_change()
@@ -24,8 +32,9 @@ def build_features(price_df, macro_df):
                           macro_features.reset_index(drop=True)], axis=1)
     return features
 
-def generate_trade_signal(price_df, macro_df):
-    model = load_model()
+def generate_trade_signal(price_df, macro_df, model_path="model.json", model=None):
+    if model is None:
+        model = load_model(model_path)
     X = build_features(price_df, macro_df)
 
     pred_prob = model.predict_proba(X)[0]
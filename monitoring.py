@@ -0,0 +1,295 @@
+import os
+import json
+import tempfile
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+from manifest import parse_model_name
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX hosts fall back to the in-process lock only
+    fcntl = None
+
+STATE_PATH = "logs/monitor_state.json"
+CALIBRATION_BINS = 10
+PSI_BINS = 10
+PSI_DRIFT_THRESHOLD = 0.2
+# PSI is biased upward on small samples (roughly (bins - 1) / n), so drift is
+# only judged once each bin could have seen ~20 live values.
+PSI_MIN_OBSERVATIONS = 20 * PSI_BINS
+# Only the per-bar price features are checked for drift. The FRED macro
+# columns are monthly trending levels repeated on every live bar, so they
+# always land in one edge bin and would flag every model shortly after deploy.
+DRIFT_FEATURES = ("return", "volatility", "momentum")
+PENDING_RETENTION_DAYS = 14  # unresolved signals older than this are dropped
+
+_state_lock = threading.Lock()
+
+
+# --- Training-time feature statistics ---
+
+def compute_feature_stats(X, bins=PSI_BINS):
+    """Quantile bin edges and expected bin shares per feature, for PSI."""
+    stats = {}
+    for col in X.columns:
+        values = X[col].dropna().to_numpy(dtype=float)
+        if values.size == 0:
+            continue
+        edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+        counts = np.bincount(np.searchsorted(edges, values, side="right"), minlength=len(edges) + 1)
+        stats[col] = {"edges": edges.tolist(), "expected": (counts / counts.sum()).tolist()}
+    return stats
+
+
+def save_feature_stats(model, stats):
+    # Stored as a booster attribute so it travels inside model.json.
+    model.get_booster().set_attr(feature_stats=json.dumps(stats))
+
+
+def load_feature_stats(model):
+    raw = model.get_booster().attr("feature_stats")
+    return json.loads(raw) if raw else {}
+
+
+def population_stability_index(expected, actual_counts, eps=1e-4):
+    actual_counts = np.asarray(actual_counts, dtype=float)
+    if actual_counts.sum() == 0:
+        return float("nan")
+    expected = np.clip(np.asarray(expected, dtype=float), eps, None)
+    actual = np.clip(actual_counts / actual_counts.sum(), eps, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+# --- Streaming state ---
+
+def load_monitor_state(state_path=STATE_PATH):
+    if os.path.exists(state_path):
+        with open(state_path) as f:
+            state = json.load(f)
+        if isinstance(state["pending"], list):
+            # Older state files kept one flat queue.
+            queued, state["pending"] = state["pending"], {}
+            for entry in queued:
+                _queue_pending(state, entry)
+        return state
+    return {"log_offset": 0, "pending": {}, "models": {}}
+
+
+def save_monitor_state(state, state_path=STATE_PATH):
+    state_dir = os.path.dirname(state_path) or "."
+    os.makedirs(state_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile("w", dir=state_dir, suffix=".tmp", delete=False) as f:
+        json.dump(state, f)
+    os.replace(f.name, state_path)
+
+
+@contextmanager
+def locked_state(state_path=STATE_PATH):
+    """Hold the monitor state for a read-modify-write.
+
+    Sessions are threads, so a process lock covers one server; the flock on
+    a sidecar file extends that to multiple worker processes.
+    """
+    os.makedirs(os.path.dirname(state_path) or ".", exist_ok=True)
+    with _state_lock, open(f"{state_path}.lock", "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            state = load_monitor_state(state_path)
+            yield state
+            save_monitor_state(state, state_path)
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _model_key(ticker, model_name):
+    return f"{ticker.upper()}|{model_name or 'unknown'}"
+
+
+def _empty_stats():
+    return {
+        "n": 0, "correct": 0, "buy_n": 0, "buy_hits": 0, "brier_sum": 0.0,
+        "calib_n": [0] * CALIBRATION_BINS,
+        "calib_p": [0.0] * CALIBRATION_BINS,
+        "calib_up": [0] * CALIBRATION_BINS,
+        "feature_counts": {},
+    }
+
+
+def update_prediction_stats(stats, signal, confidence, went_up):
+    """Fold one resolved prediction into the running stats in O(1)."""
+    p_up = confidence / 100 if signal == "Buy" else 1 - confidence / 100
+    p_up = min(max(p_up, 0.0), 1.0)
+    predicted_up = signal == "Buy"
+
+    stats["n"] += 1
+    stats["correct"] += int(predicted_up == went_up)
+    stats["brier_sum"] += (p_up - float(went_up)) ** 2
+    if predicted_up:
+        stats["buy_n"] += 1
+        stats["buy_hits"] += int(went_up)
+    b = min(int(p_up * CALIBRATION_BINS), CALIBRATION_BINS - 1)
+    stats["calib_n"][b] += 1
+    stats["calib_p"][b] += p_up
+    stats["calib_up"][b] += int(went_up)
+    return stats
+
+
+def _pending_key(entry):
+    # Pre-monitoring log lines carry no model name; they were all daily.
+    parsed = parse_model_name(entry.get("model") or "")
+    return f"{entry['ticker'].upper()}|{parsed[1] if parsed else '1d'}"
+
+
+def _queue_pending(state, entry):
+    """Queue a signal under its (ticker, timeframe), dropping stale ones.
+
+    Log lines arrive in time order, so anything older than the retention
+    window sits at the front of its queue; tickers nobody reloads stop
+    growing instead of being rescanned on every refresh.
+    """
+    queue = state["pending"].setdefault(_pending_key(entry), [])
+    queue.append(entry)
+    cutoff = pd.Timestamp(entry["timestamp"]) - pd.Timedelta(days=PENDING_RETENTION_DAYS)
+    while pd.Timestamp(queue[0]["timestamp"]) < cutoff:
+        queue.pop(0)
+
+
+def ingest_signal_log(state, log_path="logs/signal_log.jsonl"):
+    """Queue signal log lines written since the last call."""
+    if not os.path.exists(log_path):
+        return state
+    with open(log_path, "rb") as f:
+        f.seek(state["log_offset"])
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                _queue_pending(state, {k: entry.get(k) for k in
+                                       ("timestamp", "ticker", "model", "signal", "confidence", "price")})
+        state["log_offset"] = f.tell()
+    return state
+
+
+def resolve_pending(state, ticker, price_df, interval="1d"):
+    """Score queued signals for ``ticker``/``interval`` whose next bar has closed.
+
+    Signal timestamps are naive UTC; intraday bars are converted to naive UTC
+    to match, while daily signals are matched on their New York date. The
+    last bar in ``price_df`` may still be forming, so it never counts as a
+    realized next bar.
+    """
+    if price_df is None or price_df.empty:
+        return state
+    bar_times = pd.DatetimeIndex(price_df.index)
+    if bar_times.tz is not None:
+        bar_times = bar_times.tz_convert(None)
+    # The first bar stamped after the signal is its "next bar"; daily bars are
+    # stamped at midnight, so a signal logged on day D resolves at D + 1.
+    closes = np.asarray(price_df["Close"], dtype=float).reshape(-1)
+
+    key = f"{ticker.upper()}|{interval}"
+    still_pending = []
+    for entry in state["pending"].get(key, []):
+        logged = pd.Timestamp(entry["timestamp"])
+        if interval == "1d":
+            # Daily bars are naive exchange dates: a signal logged at 20:30 ET
+            # is 00:30 UTC the next day but was priced at that day's close.
+            logged = logged.tz_localize("UTC").tz_convert("America/New_York").tz_localize(None).normalize()
+        i = bar_times.searchsorted(logged, side="right")
+        if i >= len(closes) - 1:
+            still_pending.append(entry)
+            continue
+        stats = state["models"].setdefault(_model_key(ticker, entry.get("model")), _empty_stats())
+        update_prediction_stats(stats, entry["signal"], entry["confidence"], closes[i] > entry["price"])
+    if still_pending:
+        state["pending"][key] = still_pending
+    else:
+        state["pending"].pop(key, None)
+    return state
+
+
+def record_features(state, ticker, model_name, features, feature_stats, bar_time=None):
+    """Accumulate live feature values into the training-time PSI bins.
+
+    Every session refreshing on the same bar sees the same features, so each
+    (model, bar) is counted once; bars at or before the last recorded one
+    (e.g. from a session holding older prices) are skipped.
+    """
+    stats = state["models"].setdefault(_model_key(ticker, model_name), _empty_stats())
+    if bar_time is not None:
+        last = stats.get("last_feature_bar")
+        if last is not None and pd.Timestamp(bar_time) <= pd.Timestamp(last):
+            return state
+        stats["last_feature_bar"] = pd.Timestamp(bar_time).isoformat()
+    for col, ref in feature_stats.items():
+        if col not in DRIFT_FEATURES or col not in features.columns:
+            continue
+        counts = stats["feature_counts"].setdefault(col, [0] * len(ref["expected"]))
+        for value in features[col].dropna().to_numpy(dtype=float):
+            counts[int(np.searchsorted(ref["edges"], value, side="right"))] += 1
+    stats["feature_stats"] = feature_stats
+    return state
+
+
+# --- Reporting ---
+
+def summarize_stats(stats):
+    n = stats["n"]
+    feature_obs = min((sum(c) for c in stats["feature_counts"].values()), default=0)
+    calib_gap = sum(abs(p - up) for p, up in zip(stats["calib_p"], stats["calib_up"])) / n if n else float("nan")
+    psi = {col: population_stability_index(stats["feature_stats"][col]["expected"], counts)
+           for col, counts in stats["feature_counts"].items()
+           if col in DRIFT_FEATURES and col in stats.get("feature_stats", {})}
+    return {
+        "observations": n,
+        "accuracy": stats["correct"] / n if n else float("nan"),
+        "hit_rate": stats["buy_hits"] / stats["buy_n"] if stats["buy_n"] else float("nan"),
+        "brier": stats["brier_sum"] / n if n else float("nan"),
+        "calibration_error": calib_gap,
+        "feature_observations": feature_obs,
+        "max_psi": max(psi.values(), default=float("nan")),
+        "psi": psi,
+    }
+
+
+def monitoring_report(state):
+    rows = []
+    for key, stats in state["models"].items():
+        ticker, model_name = key.split("|", 1)
+        summary = summarize_stats(stats)
+        summary.pop("psi")
+        rows.append({"ticker": ticker, "model": model_name, **summary})
+    return pd.DataFrame(rows)
+
+
+def models_needing_retrain(state, min_obs=20, min_accuracy=0.5, max_brier=0.25,
+                           max_psi=PSI_DRIFT_THRESHOLD, min_feature_obs=PSI_MIN_OBSERVATIONS):
+    """(ticker, interval) pairs whose newest scored model degraded or drifted."""
+    report = monitoring_report(state)
+    if report.empty:
+        return []
+    # Names are model_<TICKER[-interval]>_<YYYYmmdd>_<HHMMSS>.json, so within a
+    # family (ticker + timeframe) the lexically last name is the newest.
+    report = report[report["model"] != "unknown"].sort_values("model")
+    report["family"] = report["model"].str.rsplit("_", n=2).str[0]
+    latest = report.groupby("family").tail(1)
+    degraded = (latest["observations"] >= min_obs) & (
+        (latest["accuracy"] < min_accuracy) | (latest["brier"] > max_brier))
+    drifted = (latest["feature_observations"] >= min_feature_obs) & (latest["max_psi"] > max_psi)
+
+    flagged = {parse_model_name(name) for name in latest.loc[degraded | drifted, "model"]}
+    return sorted(flagged - {None})
+
+
+def update_monitor(ticker, price_df, model_name=None, features=None, feature_stats=None,
+                   interval="1d", log_path="logs/signal_log.jsonl", state_path=STATE_PATH):
+    with locked_state(state_path) as state:
+        ingest_signal_log(state, log_path)
+        resolve_pending(state, ticker, price_df, interval)
+        if features is not None and feature_stats:
+            bar_time = price_df.index[-1] if price_df is not None and not price_df.empty else None
+            record_features(state, ticker, model_name, features, feature_stats, bar_time)
+    return state
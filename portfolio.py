@@ -0,0 +1,150 @@
+import numpy as np
+import pandas as pd
+
+WEIGHTING_SCHEMES = ("equal", "confidence", "volatility")
+
+
+def _rolling_std(returns, window):
+    # Column-wise rolling std via cumulative sums; partial windows are used
+    # until ``window`` observations exist so early rows still get a weight.
+    T = returns.shape[0]
+    csum = np.cumsum(returns, axis=0)
+    csq = np.cumsum(returns ** 2, axis=0)
+    lagged = np.arange(T) - window
+    prev_sum = np.where(lagged[:, None] >= 0, csum[np.maximum(lagged, 0)], 0.0)
+    prev_sq = np.where(lagged[:, None] >= 0, csq[np.maximum(lagged, 0)], 0.0)
+    n = np.minimum(np.arange(T) + 1, window)[:, None].astype(float)
+    mean = (csum - prev_sum) / n
+    var = (csq - prev_sq) / n - mean ** 2
+    var = var * n / np.maximum(n - 1, 1)
+    std = np.sqrt(np.clip(var, 0.0, None))
+    std[n[:, 0] < 2] = np.nan
+    return std
+
+
+def target_weights(signals, returns, confidence=None, weighting="equal",
+                   vol_window=20, target_vol=0.10, periods_per_year=252, max_leverage=1.0):
+    """Per-bar target weights (T x N) for long-only signals in {0, 1}."""
+    if weighting not in WEIGHTING_SCHEMES:
+        raise ValueError(f"Unknown weighting '{weighting}', expected one of {WEIGHTING_SCHEMES}")
+    active = (signals > 0).astype(float)
+
+    if weighting == "equal":
+        raw = active
+    elif weighting == "confidence":
+        if confidence is None:
+            raise ValueError("Confidence weighting requires a confidence matrix")
+        raw = active * np.nan_to_num(confidence, nan=0.0)
+    else:
+        # Give each active name an equal share of the volatility budget.
+        # Volatility is known at bar t only from returns up to t.
+        ann_vol = _rolling_std(returns, vol_window) * np.sqrt(periods_per_year)
+        n_active = np.maximum(active.sum(axis=1, keepdims=True), 1.0)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            raw = active * (target_vol / n_active) / ann_vol
+        raw = np.nan_to_num(raw, nan=0.0, posinf=0.0)
+        gross = raw.sum(axis=1, keepdims=True)
+        scale = np.where(gross > max_leverage, max_leverage / np.maximum(gross, 1e-12), 1.0)
+        return raw * scale
+
+    total = raw.sum(axis=1, keepdims=True)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        weights = np.where(total > 0, raw / total, 0.0)
+    return weights * max_leverage
+
+
+def simulate_portfolio(prices, signals, confidence=None, weighting="equal", rebalance_every=1,
+                       cost_bps=0.0, vol_window=20, target_vol=0.10, periods_per_year=252):
+    """Vectorized book-level backtest over aligned tickers x time matrices.
+
+    ``prices``, ``signals`` and the optional ``confidence`` are DataFrames
+    sharing an index (bars) and columns (tickers). Weights decided on bar t
+    earn the return of bar t + 1. Targets are only refreshed every
+    ``rebalance_every`` bars and positions drift with prices in between;
+    ``cost_bps`` is charged on the turnover from the drifted weights back
+    to target at each rebalance.
+
+    Returns ``(curve, weights)``: a DataFrame with strategy and equal-capital
+    buy & hold returns/equity, and the end-of-bar weights per ticker.
+    """
+    prices = prices.sort_index()
+    signals = signals.reindex(index=prices.index, columns=prices.columns)
+    index, columns = prices.index, prices.columns
+
+    # Carry prices over gaps (mixed exchange calendars in one batch) so a
+    # missing bar neither drops the move across it nor forces an exit.
+    px = prices.ffill().to_numpy(dtype=float)
+    sig = np.nan_to_num(signals.to_numpy(dtype=float), nan=0.0)
+    conf = None
+    if confidence is not None:
+        conf = confidence.reindex(index=index, columns=columns).to_numpy(dtype=float)
+
+    rets = np.zeros_like(px)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rets[1:] = px[1:] / px[:-1] - 1
+    rets = np.nan_to_num(rets, nan=0.0, posinf=0.0, neginf=0.0)
+    # No position in a name until its first price.
+    sig = np.where(np.isnan(px), 0.0, sig)
+
+    targets = target_weights(sig, rets, conf, weighting, vol_window, target_vol, periods_per_year)
+    T = len(index)
+    step = max(int(rebalance_every), 1)
+    rebalance_rows = (np.arange(T) // step) * step
+
+    # Between rebalances each name's weight drifts with its own growth since
+    # the last rebalance bar; any unallocated share sits in cash at 0%.
+    growth = np.cumprod(1 + rets, axis=0)
+    w0 = targets[rebalance_rows]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        since_rebalance = np.nan_to_num(growth / growth[rebalance_rows], nan=0.0, posinf=0.0)
+        value = (1 - w0.sum(axis=1)) + (w0 * since_rebalance).sum(axis=1)
+        held = np.nan_to_num(w0 * since_rebalance / value[:, None], nan=0.0, posinf=0.0)
+
+    gross_ret = np.concatenate([[0.0], (held[:-1] * rets[1:]).sum(axis=1)])
+    # Weights going into each bar's close, before any rebalance on that bar.
+    drifted = np.zeros_like(held)
+    drifted[1:] = held[:-1] * (1 + rets[1:]) / (1 + gross_ret[1:])[:, None]
+    turnover = np.abs(held - drifted).sum(axis=1)
+    strat_ret = gross_ret - turnover * cost_bps / 10_000
+
+    # True buy & hold: an equal slice of capital per ticker, bought at its
+    # first price (cash until then) and never rebalanced.
+    hold_curve = growth.mean(axis=1)
+    hold_ret = np.concatenate([[0.0], hold_curve[1:] / hold_curve[:-1] - 1])
+
+    curve = pd.DataFrame({
+        "strategy_return": strat_ret,
+        "equity_curve": np.cumprod(1 + strat_ret),
+        "buy_hold_return": hold_ret,
+        "buy_hold_curve": hold_curve,
+        "turnover": turnover,
+    }, index=index)
+    return curve, pd.DataFrame(held, index=index, columns=columns)
+
+
+def rolling_metrics(returns, window=20, periods_per_year=252):
+    """Rolling annualized return, volatility, Sharpe and running drawdown."""
+    r = np.asarray(returns, dtype=float)
+    T = len(r)
+    csum = np.concatenate([[0.0], np.cumsum(r)])
+    csq = np.concatenate([[0.0], np.cumsum(r ** 2)])
+    end = np.arange(1, T + 1)
+    start = np.maximum(end - window, 0)
+    n = (end - start).astype(float)
+    mean = (csum[end] - csum[start]) / n
+    var = ((csq[end] - csq[start]) / n - mean ** 2) * n / np.maximum(n - 1, 1)
+    vol = np.sqrt(np.clip(var, 0.0, None)) * np.sqrt(periods_per_year)
+    ann_ret = mean * periods_per_year
+    with np.errstate(divide="ignore", invalid="ignore"):
+        sharpe = np.where(vol > 0, ann_ret / vol, np.nan)
+    equity = np.cumprod(1 + r)
+    drawdown = equity / np.maximum.accumulate(equity) - 1
+
+    metrics = pd.DataFrame({
+        "rolling_return": ann_ret,
+        "rolling_volatility": vol,
+        "rolling_sharpe": sharpe,
+        "drawdown": drawdown,
+    }, index=getattr(returns, "index", None))
+    metrics.iloc[:window - 1, :3] = np.nan
+    return metrics
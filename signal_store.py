@@ -0,0 +1,188 @@
+import os
+import json
+import threading
+from contextlib import contextmanager
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # non-POSIX hosts fall back to the in-process lock only
+    fcntl = None
+
+STORE_DIR = "logs/signal_store"
+
+# column -> on-disk dtype. Categorical columns hold codes into meta["categories"].
+NUMERIC_COLUMNS = {"timestamp": np.int64, "price": np.float32, "confidence": np.float32}
+CATEGORICAL_COLUMNS = {"ticker": np.int16, "regime": np.int8, "signal": np.int8, "model": np.int32}
+
+_store_lock = threading.Lock()
+
+
+def _column_path(store_dir, column):
+    return os.path.join(store_dir, f"{column}.bin")
+
+
+def _load_meta(store_dir):
+    meta_path = os.path.join(store_dir, "meta.json")
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            return json.load(f)
+    return {"offset": 0, "rows": 0, "categories": {col: [] for col in CATEGORICAL_COLUMNS}}
+
+
+def _save_meta(store_dir, meta):
+    meta_path = os.path.join(store_dir, "meta.json")
+    tmp_path = f"{meta_path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(meta, f)
+    os.replace(tmp_path, meta_path)
+
+
+@contextmanager
+def _locked_store(store_dir):
+    # Same scheme as monitoring.locked_state: a process lock for sessions
+    # (threads) plus an flock so worker processes don't interleave appends.
+    os.makedirs(store_dir, exist_ok=True)
+    with _store_lock, open(os.path.join(store_dir, "store.lock"), "w") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _write_column(path, values, rows, rebuild):
+    if rebuild:
+        # Sessions may still hold memmaps of the old file; swap in a new one
+        # instead of truncating pages out from under those mappings.
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as out:
+            out.write(values.tobytes())
+        os.replace(tmp_path, path)
+        return
+    with open(path, "ab") as out:
+        # Drop rows written after the last committed meta (e.g. a crash mid-sync).
+        # Readers only map committed rows, so this never shrinks a live mapping.
+        out.truncate(rows * values.itemsize)
+        out.write(values.tobytes())
+
+
+def _encode(values, categories):
+    lookup = {c: i for i, c in enumerate(categories)}
+    codes = []
+    for v in values:
+        if v is None:
+            codes.append(-1)
+            continue
+        if v not in lookup:
+            lookup[v] = len(categories)
+            categories.append(v)
+        codes.append(lookup[v])
+    return codes
+
+
+def sync_signal_store(log_path="logs/signal_log.jsonl", store_dir=STORE_DIR):
+    """Append JSONL signal log lines not yet in the columnar store.
+
+    The store keeps one flat binary file per column plus ``meta.json`` with
+    the JSONL byte offset already converted, the row count and the category
+    dictionaries, so repeated syncs only parse newly logged lines.
+    """
+    if not os.path.exists(log_path):
+        return _load_meta(store_dir)
+    with _locked_store(store_dir):
+        meta = _load_meta(store_dir)
+        rebuild = os.path.getsize(log_path) < meta["offset"]
+        if rebuild:
+            # Log was truncated or replaced; rebuild from scratch.
+            meta = {"offset": 0, "rows": 0, "categories": {col: [] for col in CATEGORICAL_COLUMNS}}
+
+        with open(log_path, "rb") as f:
+            f.seek(meta["offset"])
+            entries = [json.loads(line) for line in f if line.strip()]
+            offset = f.tell()
+        if not entries and offset == meta["offset"] and not rebuild:
+            return meta
+
+        columns = {
+            "timestamp": pd.to_datetime([e["timestamp"] for e in entries]).as_unit("ns").asi8 if entries else [],
+            "price": [e.get("price", np.nan) for e in entries],
+            "confidence": [e.get("confidence", np.nan) for e in entries],
+        }
+        for col in CATEGORICAL_COLUMNS:
+            columns[col] = _encode([e.get(col) for e in entries], meta["categories"][col])
+
+        for col, dtype in {**NUMERIC_COLUMNS, **CATEGORICAL_COLUMNS}.items():
+            _write_column(_column_path(store_dir, col), np.asarray(columns[col], dtype=dtype),
+                          meta["rows"], rebuild)
+
+        meta["rows"] += len(entries)
+        meta["offset"] = offset
+        _save_meta(store_dir, meta)
+        return meta
+
+
+def load_signal_frame(log_path="logs/signal_log.jsonl", store_dir=STORE_DIR, sync=True):
+    """Signal log as a compact DataFrame backed by memory-mapped columns.
+
+    ``ticker``, ``regime``, ``signal`` and ``model`` are pandas categoricals,
+    ``price``/``confidence`` are float32 and ``timestamp`` is datetime64.
+    """
+    meta = sync_signal_store(log_path, store_dir) if sync else _load_meta(store_dir)
+    rows = meta["rows"]
+    if rows == 0:
+        raise FileNotFoundError(f"No signals stored in {store_dir}")
+
+    def column(col, dtype):
+        return np.memmap(_column_path(store_dir, col), dtype=dtype, mode="r", shape=(rows,))
+
+    data = {"timestamp": pd.to_datetime(column("timestamp", np.int64).view("datetime64[ns]"))}
+    for col, dtype in CATEGORICAL_COLUMNS.items():
+        data[col] = pd.Categorical.from_codes(column(col, dtype), categories=meta["categories"][col])
+    for col in ("confidence", "price"):
+        data[col] = column(col, NUMERIC_COLUMNS[col])
+    return pd.DataFrame(data, copy=False)
+
+
+def memory_benchmark(log_path="logs/signal_log.jsonl", store_dir=STORE_DIR):
+    """Deep memory usage of the JSON-loaded frame vs the compact frame, in bytes."""
+    with open(log_path) as f:
+        rows = [json.loads(line) for line in f if line.strip()]
+    verbose = pd.DataFrame(rows)
+    verbose["timestamp"] = pd.to_datetime(verbose["timestamp"])
+    compact = load_signal_frame(log_path, store_dir)
+    return {
+        "rows": len(compact),
+        "jsonl_frame_bytes": int(verbose.memory_usage(deep=True).sum()),
+        "compact_frame_bytes": int(compact.memory_usage(deep=True).sum()),
+        "store_bytes": sum(os.path.getsize(_column_path(store_dir, col))
+                           for col in {**NUMERIC_COLUMNS, **CATEGORICAL_COLUMNS}),
+    }
+
+
+if __name__ == "__main__":
+    import tempfile
+
+    rng = np.random.default_rng(0)
+    with tempfile.TemporaryDirectory() as tmp:
+        log_path = os.path.join(tmp, "signal_log.jsonl")
+        start = pd.Timestamp("2025-01-01")
+        with open(log_path, "w") as f:
+            for i in range(100_000):
+                buy = bool(rng.random() > 0.5)
+                f.write(json.dumps({
+                    "timestamp": (start + pd.Timedelta(minutes=5 * i)).isoformat(),
+                    "ticker": ["SPY", "QQQ", "IWM", "TLT", "GLD"][i % 5],
+                    "regime": "Bullish" if buy else "Bearish",
+                    "signal": "Buy" if buy else "Sell",
+                    "confidence": float(rng.uniform(50, 100)),
+                    "price": float(rng.uniform(100, 500)),
+                    "model": "model_SPY_20250721_145055.json",
+                }) + "\n")
+        report = memory_benchmark(log_path, os.path.join(tmp, "store"))
+    for key, value in report.items():
+        print(f"{key}: {value:,}")
+    print(f"reduction: {report['jsonl_frame_bytes'] / report['compact_frame_bytes']:.1f}x")
@@ -0,0 +1,88 @@
+import unittest
+import os
+import time
+import threading
+from datetime import datetime
+from unittest import mock
+import pandas as pd
+import utils
+from cache import SharedCache, market_aware_ttl
+
+class TestSharedCache(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("logs", exist_ok=True)
+        self.db_path = "logs/test_shared_cache.sqlite"
+
+    def test_concurrent_misses_trigger_one_fetch(self):
+        cache = SharedCache()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            time.sleep(0.2)
+            return "prices"
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("SPY", fetch, ttl=60)))
+                   for _ in range(10)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(results, ["prices"] * 10)
+
+    def test_ttl_expiry_and_empty_results(self):
+        cache = SharedCache()
+        self.assertEqual(cache.get_or_fetch("k", lambda: 1, ttl=0.05), 1)
+        self.assertEqual(cache.get_or_fetch("k", lambda: 2, ttl=0.05), 1)
+        time.sleep(0.1)
+        self.assertEqual(cache.get_or_fetch("k", lambda: 3, ttl=0.05), 3)
+
+        cache.get_or_fetch("empty", pd.DataFrame, ttl=60)
+        self.assertEqual(cache.get_or_fetch("empty", lambda: "retried", ttl=60), "retried")
+
+    def test_expired_entries_are_purged_on_insert(self):
+        cache = SharedCache(self.db_path, purge_interval=0)
+        for bar in range(5):
+            cache.get_or_fetch(("signal", bar), lambda: bar, ttl=0.05)
+        time.sleep(0.1)
+        cache.get_or_fetch(("signal", 5), lambda: 5, ttl=60)
+
+        self.assertEqual(list(cache._entries), [("signal", 5)])
+        with cache._connect() as conn:
+            self.assertEqual(conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0], 1)
+
+    def test_sqlite_tier_is_shared_between_instances(self):
+        SharedCache(self.db_path).get_or_fetch(("price", "SPY"), lambda: [1.0, 2.0], ttl=60)
+        other = SharedCache(self.db_path)
+        self.assertEqual(other.get_or_fetch(("price", "SPY"), lambda: self.fail("refetched"), ttl=60), [1.0, 2.0])
+
+    def test_closed_market_ttl_stops_at_the_open(self):
+        with mock.patch("cache.is_market_open", return_value=False), \
+                mock.patch("cache.seconds_until_market_open", return_value=300.0):
+            self.assertEqual(market_aware_ttl(closed_ttl=3600), 300.0)
+        with mock.patch("cache.is_market_open", return_value=True):
+            self.assertEqual(market_aware_ttl(open_ttl=300), 300)
+
+    def test_seconds_until_market_open(self):
+        class FrozenDatetime(datetime):
+            frozen = None
+
+            @classmethod
+            def utcnow(cls):
+                return cls.frozen
+
+        with mock.patch.object(utils, "datetime", FrozenDatetime):
+            FrozenDatetime.frozen = datetime(2025, 7, 21, 13, 25)  # Mon 09:25 EDT
+            self.assertEqual(utils.seconds_until_market_open(), 300)
+            FrozenDatetime.frozen = datetime(2025, 7, 25, 21, 0)   # Fri 17:00 EDT
+            self.assertEqual(utils.seconds_until_market_open(), (2 * 24 + 16.5) * 3600)
+
+    def tearDown(self):
+        if os.path.exists(self.db_path):
+            os.remove(self.db_path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+import numpy as np
+import pandas as pd
+from data import base_fetch_window, merge_base_bars, resample_bars
+
+def make_bars(start, minutes, offset=0.0):
+    index = pd.date_range(start, periods=minutes, freq="1min", tz="America/New_York")
+    return pd.DataFrame({"Close": np.arange(minutes, dtype=np.float64) + 100 + offset}, index=index)
+
+class TestIntradayData(unittest.TestCase):
+    def test_merge_base_bars_overwrites_overlap_and_casts_float32(self):
+        base = merge_base_bars(None, make_bars("2025-07-21 09:30", 30))
+        update = make_bars("2025-07-21 09:55", 10, offset=25.5)
+        merged = merge_base_bars(base, update)
+
+        self.assertEqual(merged["Close"].dtype, np.float32)
+        self.assertEqual(len(merged), 35)
+        self.assertTrue(merged.index.is_unique)
+        self.assertAlmostEqual(float(merged["Close"].iloc[-1]), 134.5, places=3)
+
+    def test_merge_base_bars_applies_retention(self):
+        old = make_bars("2025-07-01 09:30", 5)
+        new = make_bars("2025-07-21 09:30", 5)
+        merged = merge_base_bars(merge_base_bars(None, old), new, retention_days=7)
+        self.assertEqual(merged.index[0], new.index[0])
+
+    def test_incremental_resample_matches_full_resample(self):
+        base = merge_base_bars(None, make_bars("2025-07-21 09:30", 37))
+        partial = resample_bars(base, "5m")
+
+        base = merge_base_bars(base, make_bars("2025-07-21 10:05", 20, offset=35))
+        incremental = resample_bars(base, "5m", existing=partial)
+        full = resample_bars(base, "5m")
+
+        pd.testing.assert_frame_equal(incremental, full)
+        self.assertEqual(incremental["Close"].dtype, np.float32)
+
+    def test_hourly_bars_start_at_the_open(self):
+        base = merge_base_bars(None, make_bars("2025-07-21 09:30", 150))
+        hourly = resample_bars(base, "60m")
+        self.assertEqual([t.strftime("%H:%M") for t in hourly.index], ["09:30", "10:30", "11:30"])
+        self.assertAlmostEqual(float(hourly["Close"].iloc[0]), 159.0)
+
+        partial = resample_bars(merge_base_bars(None, make_bars("2025-07-21 09:30", 75)), "60m")
+        pd.testing.assert_frame_equal(resample_bars(base, "60m", existing=partial), hourly)
+
+    def test_fetch_window_covers_gap_since_last_bar(self):
+        self.assertEqual(base_fetch_window(None), {"period": "7d"})
+
+        base = merge_base_bars(None, make_bars("2025-07-18 15:30", 30))
+        monday = pd.Timestamp("2025-07-21 10:00", tz="America/New_York")
+        self.assertEqual(base_fetch_window(base, now=monday)["start"], base.index[-1])
+
+        much_later = pd.Timestamp("2025-08-18 10:00", tz="America/New_York")
+        self.assertEqual(base_fetch_window(base, now=much_later)["start"],
+                         much_later - pd.Timedelta(days=7))
+
+if __name__ == "__main__":
+    unittest.main()
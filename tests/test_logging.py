@@ -32,6 +32,18 @@ class TestSignalLogging(unittest.TestCase):
             self.assertIsInstance(parsed["confidence"], float)
             self.assertEqual(parsed["ticker"], "TEST")
 
+    def test_signal_log_dedup_is_per_model(self):
+        from components.dashboard_insights import log_signal_to_jsonl
+        entry = {"timestamp": "2025-07-21T15:00:00", "ticker": "TEST", "regime": "Neutral",
+                 "signal": "Hold", "confidence": 88.0, "price": 123.0, "model": "model_TEST_20250721_145055.json"}
+        log_signal_to_jsonl(entry, self.test_path)
+        log_signal_to_jsonl({**entry, "timestamp": "2025-07-21T15:05:00"}, self.test_path)
+        log_signal_to_jsonl({**entry, "model": "model_TEST-5m_20250721_145055.json"}, self.test_path)
+
+        with open(self.test_path) as f:
+            models = [json.loads(line)["model"] for line in f]
+        self.assertEqual(models, ["model_TEST_20250721_145055.json", "model_TEST-5m_20250721_145055.json"])
+
     def tearDown(self):
         if os.path.exists(self.test_path):
             os.remove(self.test_path)
\ No newline at end of file
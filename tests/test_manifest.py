@@ -0,0 +1,112 @@
+import unittest
+import os
+import json
+from unittest import mock
+import manifest as manifest_module
+from manifest import (
+    add_version,
+    available_tickers,
+    build_manifest_from_files,
+    empty_manifest,
+    latest_version,
+    parse_model_name,
+    prune_versions,
+    read_local_manifest,
+    write_local_manifest,
+)
+
+class TestModelManifest(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("logs", exist_ok=True)
+        self.path = "logs/test_model_manifest.json"
+
+    def test_seed_from_listing_and_resolve_latest(self):
+        files = [
+            {"id": "a", "name": "model_SPY_20250701_030000.json", "createdTime": "2025-07-01T03:00:00Z"},
+            {"id": "b", "name": "model_SPY_20250708_030000.json", "createdTime": "2025-07-08T03:00:00Z"},
+            {"id": "c", "name": "model_SPY-5m_20250709_030000.json", "createdTime": "2025-07-09T03:00:00Z"},
+            {"id": "d", "name": "model_QQQ_20250702_030000.json", "createdTime": "2025-07-02T03:00:00Z"},
+            {"id": "m", "name": "model_manifest.json", "createdTime": "2025-07-09T03:00:00Z"},
+            {"id": "l", "name": "model_20250721_145055.json", "createdTime": "2025-07-21T14:50:55Z"},
+        ]
+        manifest = build_manifest_from_files(files)
+
+        self.assertEqual(latest_version(manifest, "spy")["file_id"], "b")
+        self.assertEqual(latest_version(manifest, "SPY", "5m")["file_id"], "c")
+        self.assertIsNone(latest_version(manifest, "IWM"))
+        self.assertEqual(available_tickers(manifest), ["QQQ", "SPY"])
+
+    def test_parse_model_name(self):
+        self.assertEqual(parse_model_name("model_SPY_20250721_145055.json"), ("SPY", "1d"))
+        self.assertEqual(parse_model_name("model_BRK-B-15m_20250721_145055.json"), ("BRK-B", "15m"))
+        self.assertIsNone(parse_model_name("model_20250721_145055.json"))
+        self.assertIsNone(parse_model_name("model_manifest.json"))
+
+    def test_seed_listing_follows_pages(self):
+        pages = [
+            {"files": [{"id": "a", "name": "model_SPY_20250701_030000.json", "createdTime": "1"}],
+             "nextPageToken": "p2"},
+            {"files": [{"id": "b", "name": "model_QQQ_20250701_030000.json", "createdTime": "2"}]},
+        ]
+        service = mock.MagicMock()
+        service.files().list.return_value.execute.side_effect = pages
+        files = manifest_module._list_model_files(service, "folder")
+        self.assertEqual([f["id"] for f in files], ["a", "b"])
+
+    def test_update_retries_when_manifest_changes(self):
+        drive = {"manifest": empty_manifest(), "version": 1, "checks": 0}
+
+        def download(_service, _folder):
+            return json.loads(json.dumps(drive["manifest"])), "f", drive["version"]
+
+        def find(_service, _folder):
+            drive["checks"] += 1
+            if drive["checks"] == 1:
+                # Another trainer saves its version between our read and write.
+                add_version(drive["manifest"], "QQQ", "1d", {"name": "model_QQQ_20250701_030000.json",
+                                                             "file_id": "q", "created": "1", "md5": "y"})
+                drive["version"] += 1
+            return "f", drive["version"]
+
+        def update(fileId, media_body):
+            drive["manifest"], drive["version"] = json.loads(media_body.getvalue()), drive["version"] + 1
+            return mock.MagicMock()
+
+        service = mock.MagicMock()
+        service.files().update.side_effect = update
+        with mock.patch.object(manifest_module, "_download_manifest", side_effect=download), \
+                mock.patch.object(manifest_module, "_find_manifest_file", side_effect=find), \
+                mock.patch.object(manifest_module, "MediaIoBaseUpload", side_effect=lambda fh, mimetype: fh), \
+                mock.patch.object(manifest_module.time, "sleep"):
+            manifest_module.update_manifest(service, "folder", lambda m: add_version(
+                m, "SPY", "1d", {"name": "model_SPY_20250701_030000.json", "file_id": "a",
+                                 "created": "2", "md5": "x"}), path=self.path)
+
+        self.assertEqual(service.files().update.call_count, 1)
+        saved = read_local_manifest(self.path)
+        self.assertEqual(latest_version(saved, "SPY")["file_id"], "a")
+        self.assertEqual(latest_version(saved, "QQQ")["file_id"], "q")
+
+    def test_add_and_prune_versions(self):
+        manifest = empty_manifest()
+        for day in range(1, 8):
+            add_version(manifest, "SPY", "1d", {"name": f"model_SPY_2025070{day}_030000.json",
+                                                "file_id": str(day), "created": f"2025-07-0{day}T03:00:00Z",
+                                                "md5": "x", "features": ["return"]})
+        add_version(manifest, "SPY", "1d", {"name": "model_SPY_20250707_030000.json", "file_id": "7",
+                                            "created": "2025-07-07T03:00:00Z", "md5": "y"})
+
+        removed = prune_versions(manifest, "SPY", "1d", max_versions=5)
+        self.assertEqual([v["file_id"] for v in removed], ["1", "2"])
+        self.assertEqual(len(manifest["models"]["SPY"]), 5)
+        self.assertEqual(latest_version(manifest, "SPY")["md5"], "y")
+
+        write_local_manifest(manifest, self.path)
+        self.assertEqual(read_local_manifest(self.path), manifest)
+
+    def tearDown(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+if __name__ == "__main__":
+    unittest.main()
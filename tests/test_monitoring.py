@@ -0,0 +1,133 @@
+import unittest
+import os
+import json
+import threading
+import numpy as np
+import pandas as pd
+from model import model_prefix
+from monitoring import (
+    compute_feature_stats,
+    population_stability_index,
+    update_monitor,
+    summarize_stats,
+    models_needing_retrain,
+)
+
+class TestModelMonitoring(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("logs", exist_ok=True)
+        self.log_path = "logs/test_monitor_signal_log.jsonl"
+        self.state_path = "logs/test_monitor_state.json"
+        self.model = "model_TEST_20250721_145055.json"
+        self.prices = pd.DataFrame({"Close": [100.0, 101.0, 99.0, 102.0, 103.0]},
+                                   index=pd.date_range("2025-07-21", periods=5, freq="D"))
+
+    def _log(self, *entries):
+        with open(self.log_path, "a") as f:
+            for ts, signal, confidence, price in entries:
+                f.write(json.dumps({"timestamp": ts, "ticker": "TEST", "regime": "Neutral", "signal": signal,
+                                    "confidence": confidence, "price": price, "model": self.model}) + "\n")
+
+    def test_signals_are_scored_once_next_bar_has_closed(self):
+        self._log(("2025-07-21T15:00:00", "Buy", 80.0, 100.0),
+                  ("2025-07-22T15:00:00", "Buy", 60.0, 101.0))
+        # The last bar (07-23) may still be forming, so only 07-21 resolves.
+        state = update_monitor("TEST", self.prices.iloc[:3], log_path=self.log_path, state_path=self.state_path)
+        stats = state["models"][f"TEST|{self.model}"]
+        self.assertEqual(stats["n"], 1)
+        self.assertEqual(len(state["pending"]["TEST|1d"]), 1)
+
+        self._log(("2025-07-23T15:00:00", "Sell", 70.0, 99.0))
+        state = update_monitor("TEST", self.prices, log_path=self.log_path, state_path=self.state_path)
+        summary = summarize_stats(state["models"][f"TEST|{self.model}"])
+        self.assertEqual(summary["observations"], 3)
+        self.assertEqual(state["pending"], {})
+        # Buy@100 -> 101 up, Buy@101 -> 99 down, Sell@99 -> 102 up
+        self.assertAlmostEqual(summary["accuracy"], 1 / 3)
+        self.assertAlmostEqual(summary["hit_rate"], 0.5)
+        self.assertAlmostEqual(summary["brier"], (0.2 ** 2 + 0.6 ** 2 + 0.7 ** 2) / 3)
+
+    def test_daily_signals_resolve_on_new_york_date(self):
+        # 20:30 ET on 07-21 is already 07-22 in UTC; it still resolves at 07-22's close.
+        self._log(("2025-07-22T00:30:00", "Buy", 80.0, 100.0))
+        state = update_monitor("TEST", self.prices, log_path=self.log_path, state_path=self.state_path)
+        self.assertEqual(summarize_stats(state["models"][f"TEST|{self.model}"])["accuracy"], 1.0)
+
+    def test_stale_pending_signals_are_dropped(self):
+        self._log(("2025-07-01T15:00:00", "Buy", 80.0, 100.0),
+                  ("2025-07-02T15:00:00", "Buy", 80.0, 100.0),
+                  ("2025-07-21T15:00:00", "Buy", 80.0, 100.0))
+        # Nothing reloads this ticker's prices, yet its queue stays bounded.
+        state = update_monitor("OTHER", None, log_path=self.log_path, state_path=self.state_path)
+        self.assertEqual([e["timestamp"] for e in state["pending"]["TEST|1d"]], ["2025-07-21T15:00:00"])
+
+    def test_other_timeframes_are_not_scored(self):
+        self._log(("2025-07-21T15:00:00", "Buy", 80.0, 100.0))
+        bars = pd.DataFrame({"Close": [100.0, 101.0, 102.0]},
+                            index=pd.date_range("2025-07-22 13:30", periods=3, freq="5min", tz="UTC"))
+        state = update_monitor("TEST", bars, interval="5m", log_path=self.log_path, state_path=self.state_path)
+        self.assertEqual(state["models"], {})
+        self.assertEqual(list(state["pending"]), ["TEST|1d"])
+
+    def test_features_recorded_once_per_bar_under_concurrency(self):
+        stats = compute_feature_stats(pd.DataFrame({"return": np.linspace(-1, 1, 100)}))
+        features = pd.DataFrame({"return": [0.0]})
+
+        def refresh(bars):
+            update_monitor("TEST", bars, self.model, features=features, feature_stats=stats,
+                           log_path=self.log_path, state_path=self.state_path)
+
+        threads = [threading.Thread(target=refresh, args=(self.prices.iloc[:n],))
+                   for n in (2, 3, 4, 5) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        with open(self.state_path) as f:
+            state = json.load(f)
+        self.assertLessEqual(summarize_stats(state["models"][f"TEST|{self.model}"])["feature_observations"], 4)
+        self.assertGreaterEqual(summarize_stats(state["models"][f"TEST|{self.model}"])["feature_observations"], 1)
+
+    def test_feature_drift_flags_ticker(self):
+        rng = np.random.default_rng(0)
+        stats = compute_feature_stats(pd.DataFrame({"return": rng.normal(0, 1, 1000)}))
+        self.assertLess(population_stability_index(stats["return"]["expected"],
+                                                   np.array(stats["return"]["expected"]) * 100), 1e-9)
+
+        shifted = pd.DataFrame({"return": rng.normal(3, 1, 200)})
+        state = update_monitor("TEST", None, self.model, features=shifted, feature_stats=stats,
+                               log_path=self.log_path, state_path=self.state_path)
+        self.assertGreater(summarize_stats(state["models"][f"TEST|{self.model}"])["max_psi"], 0.2)
+        self.assertEqual(models_needing_retrain(state), [("TEST", "1d")])
+
+    def test_constant_macro_levels_do_not_flag_drift(self):
+        rng = np.random.default_rng(0)
+        train = pd.DataFrame({"return": rng.normal(0, 1, 100), "Consumer Price Index": np.linspace(250, 320, 100)})
+        stats = compute_feature_stats(train)
+        for day in pd.date_range("2025-01-01", periods=250, freq="D"):
+            live = pd.DataFrame({"return": [rng.normal(0, 1)], "Consumer Price Index": [320.0]})
+            bars = pd.DataFrame({"Close": [100.0]}, index=[day])
+            state = update_monitor("TEST", bars, self.model, features=live, feature_stats=stats,
+                                   log_path=self.log_path, state_path=self.state_path)
+        summary = summarize_stats(state["models"][f"TEST|{self.model}"])
+        self.assertEqual(summary["feature_observations"], 250)
+        self.assertNotIn("Consumer Price Index", summary["psi"])
+        self.assertEqual(models_needing_retrain(state), [])
+
+    def test_retrain_parses_hyphenated_tickers(self):
+        stats = compute_feature_stats(pd.DataFrame({"return": np.linspace(-1, 1, 100)}))
+        shifted = pd.DataFrame({"return": np.full(200, 5.0)})
+        for ticker, interval in (("BRK-B", "1d"), ("BRK-B", "15m")):
+            model = f"{model_prefix(ticker, interval)}20250721_145055.json"
+            state = update_monitor(ticker, None, model, features=shifted, feature_stats=stats,
+                                   interval=interval, log_path=self.log_path, state_path=self.state_path)
+        self.assertEqual(models_needing_retrain(state), [("BRK-B", "15m"), ("BRK-B", "1d")])
+
+    def tearDown(self):
+        for path in (self.log_path, self.state_path, f"{self.state_path}.lock"):
+            if os.path.exists(path):
+                os.remove(path)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import unittest
+import numpy as np
+import pandas as pd
+from portfolio import simulate_portfolio, rolling_metrics
+
+class TestPortfolioSimulation(unittest.TestCase):
+    def setUp(self):
+        index = pd.date_range("2025-01-01", periods=6, freq="D")
+        self.prices = pd.DataFrame({
+            "AAA": [100, 110, 121, 121, 133.1, 133.1],
+            "BBB": [50, 50, 45, 45, 45, 49.5],
+        }, index=index)
+
+    def test_equal_weight_uses_previous_bar_signal(self):
+        signals = pd.DataFrame(1.0, index=self.prices.index, columns=self.prices.columns)
+        curve, weights = simulate_portfolio(self.prices, signals)
+
+        np.testing.assert_allclose(weights.to_numpy(), 0.5)
+        expected = np.array([0.0, 0.05, 0.0, 0.0, 0.05, 0.05])
+        np.testing.assert_allclose(curve["strategy_return"], expected, atol=1e-12)
+        # Buy & hold never rebalances: half the capital in each name from bar 0.
+        np.testing.assert_allclose(curve["buy_hold_curve"], [1.0, 1.05, 1.055, 1.055, 1.1155, 1.1605])
+
+    def test_flat_signal_and_costs(self):
+        signals = pd.DataFrame(0.0, index=self.prices.index, columns=self.prices.columns)
+        signals.loc[:, "AAA"] = 1.0
+        curve, _ = simulate_portfolio(self.prices, signals, cost_bps=10)
+
+        # Entering AAA on the first bar costs 10bps of full turnover.
+        self.assertAlmostEqual(curve["strategy_return"].iloc[0], -0.001)
+        self.assertAlmostEqual(curve["strategy_return"].iloc[1], 0.10)
+        self.assertAlmostEqual(curve["turnover"].iloc[1:].sum(), 0.0)
+
+    def test_rebalance_holds_weights_between_dates(self):
+        signals = pd.DataFrame(0.0, index=self.prices.index, columns=self.prices.columns)
+        signals.iloc[1:, 0] = 1.0
+        _, weights = simulate_portfolio(self.prices, signals, rebalance_every=3)
+        np.testing.assert_allclose(weights["AAA"], [0, 0, 0, 1, 1, 1])
+
+    def test_weights_drift_between_rebalances_and_pay_costs(self):
+        signals = pd.DataFrame(1.0, index=self.prices.index, columns=self.prices.columns)
+        curve, weights = simulate_portfolio(self.prices, signals, rebalance_every=3, cost_bps=10)
+
+        # Bar 1: AAA +10%, BBB flat -> 0.55 / 0.5 of 1.05.
+        np.testing.assert_allclose(weights.iloc[1], [0.55 / 1.05, 0.5 / 1.05])
+        self.assertAlmostEqual(curve["turnover"].iloc[1], 0.0)
+        self.assertAlmostEqual(curve["turnover"].iloc[2], 0.0)
+        # Bar 3 rebalances the drifted book back to 50/50.
+        np.testing.assert_allclose(weights.iloc[3], [0.5, 0.5])
+        self.assertGreater(curve["turnover"].iloc[3], 0.0)
+        # With no rebalancing inside the window, the book matches buy & hold.
+        np.testing.assert_allclose(curve["equity_curve"].iloc[1:3] / curve["equity_curve"].iloc[0],
+                                   curve["buy_hold_curve"].iloc[1:3])
+
+    def test_price_gaps_are_carried_forward(self):
+        index = pd.date_range("2025-01-01", periods=4, freq="D")
+        prices = pd.DataFrame({"AAA": [100, np.nan, 110, 110]}, index=index)
+        signals = pd.DataFrame(1.0, index=index, columns=prices.columns)
+        curve, weights = simulate_portfolio(prices, signals, cost_bps=10)
+
+        # The move across the missing bar still counts, and the gap is no exit.
+        np.testing.assert_allclose(weights["AAA"], 1.0)
+        np.testing.assert_allclose(curve["turnover"], [1.0, 0.0, 0.0, 0.0])
+        np.testing.assert_allclose(curve["strategy_return"], [-0.001, 0.0, 0.10, 0.0], atol=1e-12)
+        np.testing.assert_allclose(curve["buy_hold_curve"], [1.0, 1.0, 1.1, 1.1])
+
+    def test_no_position_before_first_price(self):
+        prices = self.prices.copy()
+        prices.iloc[:2, 1] = np.nan
+        signals = pd.DataFrame(1.0, index=prices.index, columns=prices.columns)
+        _, weights = simulate_portfolio(prices, signals)
+        np.testing.assert_allclose(weights["BBB"].iloc[:2], 0.0)
+        np.testing.assert_allclose(weights["BBB"].iloc[2:], 0.5)
+
+    def test_confidence_and_volatility_weighting(self):
+        signals = pd.DataFrame(1.0, index=self.prices.index, columns=self.prices.columns)
+        confidence = pd.DataFrame({"AAA": 75.0, "BBB": 25.0}, index=self.prices.index)
+        _, weights = simulate_portfolio(self.prices, signals, confidence, weighting="confidence")
+        np.testing.assert_allclose(weights.iloc[-1], [0.75, 0.25])
+
+        _, weights = simulate_portfolio(self.prices, signals, weighting="volatility", vol_window=3)
+        self.assertTrue((weights.sum(axis=1) <= 1.0 + 1e-9).all())
+        self.assertTrue((weights.to_numpy() >= 0).all())
+
+    def test_rolling_metrics_drawdown(self):
+        returns = pd.Series([0.0, 0.10, -0.10, 0.05])
+        metrics = rolling_metrics(returns, window=2)
+        self.assertAlmostEqual(metrics["drawdown"].iloc[2], -0.10)
+        self.assertTrue(np.isnan(metrics["rolling_sharpe"].iloc[0]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import unittest
+import os
+import json
+import shutil
+import multiprocessing
+import numpy as np
+import pandas as pd
+from signal_store import load_signal_frame, memory_benchmark, sync_signal_store
+
+
+def _sync_repeatedly(log_path, store_dir):
+    for _ in range(20):
+        sync_signal_store(log_path, store_dir)
+
+class TestSignalStore(unittest.TestCase):
+    def setUp(self):
+        os.makedirs("logs", exist_ok=True)
+        self.log_path = "logs/test_store_signal_log.jsonl"
+        self.store_dir = "logs/test_signal_store"
+
+    def _log(self, *entries):
+        with open(self.log_path, "a") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+
+    def test_round_trip_and_incremental_append(self):
+        self._log({"timestamp": "2025-07-21T10:00:00", "ticker": "SPY", "regime": "Bullish",
+                   "signal": "Buy", "confidence": 64.2, "price": 560.25})
+        df = load_signal_frame(self.log_path, self.store_dir)
+        self.assertEqual(len(df), 1)
+        self.assertIsInstance(df["ticker"].dtype, pd.CategoricalDtype)
+        self.assertEqual(df["price"].dtype, np.float32)
+        self.assertEqual(df["timestamp"].iloc[0], pd.Timestamp("2025-07-21T10:00:00"))
+        self.assertTrue(pd.isna(df["model"].iloc[0]))
+
+        self._log({"timestamp": "2025-07-22T10:00:00", "ticker": "QQQ", "regime": "Bearish",
+                   "signal": "Sell", "confidence": 55.0, "price": 480.5, "model": "model_QQQ_20250721_145055.json"},
+                  {"timestamp": "2025-07-23T10:00:00", "ticker": "SPY", "regime": "Bearish",
+                   "signal": "Sell", "confidence": 70.0, "price": 555.0})
+        df = load_signal_frame(self.log_path, self.store_dir)
+        self.assertEqual(df["ticker"].tolist(), ["SPY", "QQQ", "SPY"])
+        self.assertEqual(df["signal"].tolist(), ["Buy", "Sell", "Sell"])
+        self.assertAlmostEqual(float(df["confidence"].iloc[1]), 55.0, places=4)
+        self.assertEqual(df["model"].iloc[1], "model_QQQ_20250721_145055.json")
+
+    def test_rebuild_leaves_open_frames_intact(self):
+        self._log(*[{"timestamp": "2025-07-21T10:00:00", "ticker": "SPY", "regime": "Bullish",
+                     "signal": "Buy", "confidence": 60.0, "price": 500.0 + i} for i in range(100)])
+        old = load_signal_frame(self.log_path, self.store_dir)
+
+        os.remove(self.log_path)
+        self._log({"timestamp": "2025-07-22T10:00:00", "ticker": "QQQ", "regime": "Bearish",
+                   "signal": "Sell", "confidence": 55.0, "price": 480.5})
+        new = load_signal_frame(self.log_path, self.store_dir)
+
+        self.assertEqual(new["ticker"].tolist(), ["QQQ"])
+        # The rebuild swapped in new files, so the old memmaps still read the old rows.
+        self.assertEqual(len(old), 100)
+        self.assertAlmostEqual(float(old["price"].iloc[-1]), 599.0)
+
+    def test_concurrent_processes_sync_each_line_once(self):
+        self._log(*[{"timestamp": "2025-07-21T10:00:00", "ticker": "SPY", "regime": "Bullish",
+                     "signal": "Buy", "confidence": 60.0, "price": 500.0 + i} for i in range(200)])
+        workers = [multiprocessing.Process(target=_sync_repeatedly, args=(self.log_path, self.store_dir))
+                   for _ in range(4)]
+        for p in workers:
+            p.start()
+        for p in workers:
+            p.join()
+
+        df = load_signal_frame(self.log_path, self.store_dir, sync=False)
+        self.assertEqual(df["price"].tolist(), [500.0 + i for i in range(200)])
+
+    def test_compact_frame_uses_less_memory(self):
+        self._log(*[{"timestamp": f"2025-07-21T10:{i % 60:02d}:00", "ticker": "SPY", "regime": "Bullish",
+                     "signal": "Buy", "confidence": 60.0, "price": 500.0 + i} for i in range(500)])
+        report = memory_benchmark(self.log_path, self.store_dir)
+        self.assertEqual(report["rows"], 500)
+        self.assertLess(report["compact_frame_bytes"], report["jsonl_frame_bytes"] / 4)
+
+    def tearDown(self):
+        if os.path.exists(self.log_path):
+            os.remove(self.log_path)
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -13,8 +13,10 @@ from googleapiclient.http import MediaFileUpload
 from googleapiclient.errors import HttpError
 
 from data import get_macro_data, get_price_data
-from model import build_features
+from model import build_features, model_prefix
 from utils import load_secrets
+from manifest import add_version, prune_versions, update_manifest, file_md5
+from monitoring import STATE_PATH, compute_feature_stats, save_feature_stats, load_monitor_state, models_needing_retrain
 
 def get_drive_service():
     creds_json = os.getenv("GDRIVE_CREDENTIALS_JSON")
@@ -24,12 +26,13 @@ def get_drive_service():
     creds = service_account.Credentials.from_service_account_info(creds_dict)
     return build("drive", "v3", credentials=creds)
 
-def upload_to_drive(filepath, ticker, retries=3):
+def upload_to_drive(filepath, ticker, retries=3, interval="1d", metadata=None, max_versions=5):
     service = get_drive_service()
-    name_root = f"model_{ticker.upper()}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
+    folder_id = os.environ["GDRIVE_FOLDER_ID"]
+    name_root = f"{model_prefix(ticker, interval)}{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
     file_metadata = {
         'name': name_root,
-        'parents': [os.environ["GDRIVE_FOLDER_ID"]],
+        'parents': [folder_id],
     }
     media = MediaFileUpload(filepath, resumable=True)
 
@@ -38,33 +41,50 @@ def upload_to_drive(filepath, ticker, retries=3):
             uploaded = service.files().create(
                 body=file_metadata,
                 media_body=media,
-                fields='id'
+                fields='id, createdTime'
             ).execute()
             print(f"📤 Uploaded: {name_root}")
-            cleanup_old_models(ticker=ticker, folder_id=os.environ["GDRIVE_FOLDER_ID"])
-            return
+            break
         except HttpError as e:
             print(f"⚠️ Upload attempt {attempt+1} failed: {e}")
             time.sleep(2 * (attempt + 1))
-    raise RuntimeError("Upload failed after multiple attempts")
+    else:
+        raise RuntimeError("Upload failed after multiple attempts")
 
-def cleanup_old_models(ticker, folder_id, max_versions=5):
+    version = {
+        "name": name_root,
+        "file_id": uploaded["id"],
+        "created": uploaded["createdTime"],
+        "md5": file_md5(filepath),
+        **(metadata or {}),
+    }
+
+    def register(manifest):
+        add_version(manifest, ticker, interval, version)
+        return prune_versions(manifest, ticker, interval, max_versions)
+
+    _delete_files(service, update_manifest(service, folder_id, register))
+
+def _delete_files(service, versions):
+    # Only called once the manifest no longer references these versions.
+    for old in versions:
+        try:
+            service.files().delete(fileId=old["file_id"]).execute()
+            print(f"🗑️ Deleted old model: {old['name']}")
+        except HttpError as e:
+            print(f"⚠️ Could not delete {old['name']}: {e}")
+
+def cleanup_old_models(ticker, folder_id, max_versions=5, interval="1d"):
     service = get_drive_service()
-    prefix = f"model_{ticker.upper()}_"
-    query = f"'{folder_id}' in parents and trashed = false and name contains '{prefix}'"
-    files = service.files().list(q=query, fields="files(id, name, createdTime)").execute().get("files", [])
-    if len(files) <= max_versions:
-        return
-    files.sort(key=lambda f: f["createdTime"])
-    for old in files[:-max_versions]:
-        service.files().delete(fileId=old["id"]).execute()
-        print(f"🗑️ Deleted old model: {old['name']}")
-
-def run_training_pipeline(ticker="SPY", lookback=180):
+    removed = update_manifest(service, folder_id,
+                              lambda manifest: prune_versions(manifest, ticker, interval, max_versions))
+    _delete_files(service, removed)
+
+def run_training_pipeline(ticker="SPY", lookback=180, interval="1d"):
     secrets = load_secrets()
     fred_key = secrets.get("FRED_API_KEY")
     macro_df = get_macro_data(fred_key)
-    price_df = get_price_data(ticker, lookback)
+    price_df = get_price_data(ticker, lookback, interval=interval)
 
     if price_df.empty or macro_df.empty:
         raise ValueError("❌ Could not retrieve data")
@@ -83,8 +103,21 @@ def run_training_pipeline(ticker="SPY", lookback=180):
 
     model = xgb.XGBClassifier(use_label_encoder=False, eval_metric="logloss")
     model.fit(X, y)
+    save_feature_stats(model, compute_feature_stats(price_features))
 
     model_path = "model.json"
     model.save_model(model_path)
-    upload_to_drive(model_path, ticker)
-    return f"✅ Retrained model for {ticker} uploaded to Drive."
\ No newline at end of file
+    metadata = {
+        "features": list(X.columns),
+        "training_window": {"start": str(df.index[0]), "end": str(df.index[-1]), "rows": len(X)},
+        "metrics": {"train_accuracy": float(model.score(X, y)), "up_share": float(y.mean())},
+    }
+    upload_to_drive(model_path, ticker, interval=interval, metadata=metadata)
+    return f"✅ Retrained {interval} model for {ticker} uploaded to Drive."
+
+def retrain_degraded_models(state_path=STATE_PATH, **thresholds):
+    state = load_monitor_state(state_path)
+    results = []
+    for ticker, interval in models_needing_retrain(state, **thresholds):
+        results.append(run_training_pipeline(ticker=ticker, interval=interval))
+    return results
@@ -1,4 +1,6 @@
 import os
+from datetime import datetime, timedelta
+import pytz
 from dotenv import load_dotenv
 
 def load_secrets():
@@ -18,4 +20,23 @@ def load_secrets():
         secrets["FRED_API_KEY"] = os.getenv("FRED_API_KEY")
         secrets["GDRIVE_FOLDER_ID"] = os.getenv("GDRIVE_FOLDER_ID")
 
-    return secrets
\ No newline at end of file
+    return secrets
+
+def is_market_open():
+    now_utc = datetime.utcnow()
+    est = pytz.utc.localize(now_utc).astimezone(pytz.timezone("US/Eastern"))
+    open_time = est.replace(hour=9, minute=30, second=0, microsecond=0)
+    close_time = est.replace(hour=16, minute=0, microsecond=0)
+    return est.weekday() < 5 and open_time <= est <= close_time
+
+def seconds_until_market_open():
+    now_utc = datetime.utcnow()
+    est = pytz.utc.localize(now_utc).astimezone(pytz.timezone("US/Eastern"))
+    next_open = est.replace(hour=9, minute=30, second=0, microsecond=0)
+    if est >= next_open:
+        next_open += timedelta(days=1)
+    while next_open.weekday() >= 5:
+        next_open += timedelta(days=1)
+    # Re-localize so the day steps stay correct across a DST change.
+    next_open = pytz.timezone("US/Eastern").localize(next_open.replace(tzinfo=None))
+    return max((next_open - est).total_seconds(), 0.0)